@@ -163,14 +163,30 @@ class NostrFilterClient {
     this.latestTimestamp = event.created_at;
 
     // Parse filter content
-    try {
-      const filterData = JSON.parse(event.content);
-      if (this.onUpdate) {
-        this.onUpdate(filterData);
-      }
-    } catch (e) {
-      console.error('[AdaBlock/Nostr] Failed to parse filter content:', e);
+    this.decodeContent(event)
+      .then((filterData) => {
+        if (this.onUpdate) {
+          this.onUpdate(filterData);
+        }
+      })
+      .catch((e) => {
+        console.error('[AdaBlock/Nostr] Failed to parse filter content:', e);
+      });
+  }
+
+  /**
+   * Decode event content into filter data.
+   * Content is a JSON string, or gzipped base64 JSON when tagged ["encoding", "gzip+b64"]
+   */
+  async decodeContent(event) {
+    const encoding = event.tags?.find(t => t[0] === 'encoding');
+    if (!encoding || encoding[1] !== 'gzip+b64') {
+      return JSON.parse(event.content);
     }
+
+    const bytes = Uint8Array.from(atob(event.content), c => c.charCodeAt(0));
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+    return JSON.parse(await new Response(stream).text());
   }
 
   /**
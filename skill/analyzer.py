@@ -8,19 +8,40 @@ import hashlib
 import json
 import os
 import re
+import sqlite3
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from difflib import unified_diff
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     from bs4 import BeautifulSoup
 except ImportError:
     print("Install dependencies: pip install requests beautifulsoup4")
     sys.exit(1)
 
+# Optional: lxml parses HTML much faster than the pure-Python parser.
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Optional: orjson serializes large rule sets much faster than json.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: RE2 scans in linear time; fall back to the stdlib engine.
+try:
+    import re2 as regex
+except ImportError:
+    regex = re
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 CONFIG_PATH = SCRIPT_DIR / "config.json"
@@ -28,35 +49,85 @@ CACHE_DIR = SCRIPT_DIR / "cache"
 OUTPUT_DIR = SCRIPT_DIR / "output"
 FILTERS_DIR = SCRIPT_DIR.parent / "extension" / "filters"
 
-# Known patterns that indicate ad-related code
+# Max concurrent HTTP requests
+FETCH_WORKERS = 16
+
+# Known patterns that indicate ad-related code. Each captures its value in a
+# single named group; GROUP_BUCKETS groups are filed directly, the rest go
+# through classify_pattern().
 AD_PATTERN_REGEXES = [
     # CSS class names used for ads
-    r'(?:class(?:Name)?[=:]\s*["\'])([^"\']*(?:ad[-_]|sponsor|promo|banner)[^"\']*)["\']',
+    rb'(?:class(?:Name)?[=:]\s*["\'])(?P<class_attr>[^"\']*(?:ad[-_]|sponsor|promo|banner)[^"\']*)["\']',
     # Element IDs for ad containers
-    r'(?:id[=:]\s*["\'])([^"\']*(?:ad[-_]|player-ads|masthead-ad|ad-slot)[^"\']*)["\']',
+    rb'(?:id[=:]\s*["\'])(?P<id_attr>[^"\']*(?:ad[-_]|player-ads|masthead-ad|ad-slot)[^"\']*)["\']',
     # Ad-related function/variable names
-    r'(?:function|var|let|const)\s+((?:ad|Ad|AD)[A-Za-z_]+)',
+    rb'(?:function|var|let|const)\s+(?P<declaration>(?:ad|Ad|AD)[A-Za-z_]+)',
     # YouTube-specific ad class patterns
-    r'(ytp-ad-[a-zA-Z-]+)',
-    r'(ytd-(?:ad|promoted|banner|display-ad|in-feed-ad)[a-zA-Z-]*-renderer)',
+    rb'(?P<ytp_classes>ytp-ad-[a-zA-Z-]+)',
+    rb'(?P<renderers>ytd-(?:ad|promoted|banner|display-ad|in-feed-ad)[a-zA-Z-]*-renderer)',
     # Enforcement/anti-adblock patterns
-    r'(enforcement[A-Za-z_-]*)',
-    r'(adblock(?:er)?[A-Za-z_-]*)',
+    rb'(?P<enforcement>enforcement[A-Za-z_-]*)',
+    rb'(?P<adblock>adblock(?:er)?[A-Za-z_-]*)',
     # Ad URL patterns
-    r'["\'](/(?:pagead|ptracking|ad_companion|get_midroll)[^"\']*)["\']',
+    rb'["\'](?P<url>/(?:pagead|ptracking|ad_companion|get_midroll)[^"\']*)["\']',
 ]
 
+# Compiled once; scanned one pattern at a time so each can skip ahead to its own
+# literal and overlapping matches (e.g. a ytp-ad- class inside a className list)
+# are all reported. Patterns are bytes so fetched scripts can be scanned without
+# decoding them first.
+AD_RES = [regex.compile(pattern) for pattern in AD_PATTERN_REGEXES]
+AD_RE_GROUPS = [(next(iter(compiled.groupindex)), compiled) for compiled in AD_RES]
+# Only groups whose values always land in the same bucket; enforcement/adblock
+# matches such as "adblocker-renderer" still belong with the renderers.
+GROUP_BUCKETS = {
+    "ytp_classes": "ytp_classes",
+    "renderers": "renderers",
+}
+# Literals the patterns above key on; inline scripts with none of them (and no
+# lowercase ad-prefixed declaration) are skipped
+INLINE_SCRIPT_KEYWORDS = (
+    "ad-", "ad_", "Ad", "AD", "adblock", "player-ads", "masthead-ad",
+    "sponsor", "promo", "banner", "ytp-", "ytd-", "enforcement",
+    "pagead", "ptracking", "get_midroll",
+)
+INLINE_DECLARATION_RE = re.compile(r'(?:function|var|let|const)\s+ad')
+# Bump when extract_ad_patterns() buckets values differently; cached inline-script
+# results are keyed by this and the pattern set, so either change invalidates them.
+EXTRACTOR_VERSION = 2
+INLINE_CACHE_KEY = hashlib.blake2b(
+    b"%d\0" % EXTRACTOR_VERSION + b"\0".join(AD_PATTERN_REGEXES), digest_size=32
+).digest()
+LOWER_START_RE = re.compile(r'^[a-z]')
+FUNCTION_START_RE = re.compile(r'^[A-Z]|^ad')
+
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Accept-Language": "en-US,en;q=0.9",
 }
 
+# Shared keep-alive connections; requests already negotiates gzip (and br
+# when a brotli decoder is installed) by default.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32))
+
 
 def load_config():
     with open(CONFIG_PATH) as f:
         return json.load(f)
 
 
+def write_json(path: Path, data, indent: bool = False):
+    """Write data as JSON, pretty-printed only when it is meant to be read."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0))
+    elif indent:
+        path.write_text(json.dumps(data, indent=2))
+    else:
+        path.write_text(json.dumps(data, separators=(",", ":")))
+
+
 def ensure_dirs():
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -64,14 +135,25 @@ def ensure_dirs():
 
 def fetch_page(url: str) -> str:
     """Fetch a URL and return HTML content."""
-    resp = requests.get(url, headers=HEADERS, timeout=30)
+    resp = SESSION.get(url, timeout=30)
     resp.raise_for_status()
     return resp.text
 
 
-def extract_script_urls(html: str, base_url: str = "https://www.youtube.com") -> list[str]:
-    """Extract JavaScript source URLs from HTML."""
-    soup = BeautifulSoup(html, "html.parser")
+def fetch_pages(urls: list[str]) -> dict[str, str | Exception]:
+    """Fetch pages concurrently and return {url: html or the error raised}."""
+    def fetch(url):
+        try:
+            return fetch_page(url)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        return dict(zip(urls, pool.map(fetch, urls)))
+
+
+def extract_script_urls(soup: BeautifulSoup, base_url: str = "https://www.youtube.com") -> list[str]:
+    """Extract JavaScript source URLs from a parsed page."""
     urls = []
     for script in soup.find_all("script", src=True):
         src = script["src"]
@@ -83,40 +165,102 @@ def extract_script_urls(html: str, base_url: str = "https://www.youtube.com") ->
     return urls
 
 
-def fetch_scripts(urls: list[str]) -> dict[str, str]:
-    """Fetch JavaScript files and return {url: content}."""
-    scripts = {}
-    for url in urls:
+def fetch_scripts(urls: list[str]) -> dict[str, bytes]:
+    """Fetch JavaScript files concurrently and return {url: raw content}."""
+    def fetch(url):
         try:
-            resp = requests.get(url, headers=HEADERS, timeout=30)
+            resp = SESSION.get(url, timeout=30)
             if resp.status_code == 200:
-                scripts[url] = resp.text
+                return resp.content
         except Exception as e:
             print(f"  Failed to fetch {url}: {e}")
-    return scripts
-
-
-def compute_hash(content: str) -> str:
-    return hashlib.sha256(content.encode()).hexdigest()[:16]
-
-
-def load_cached_scripts() -> dict:
-    """Load previously cached script hashes and content."""
-    cache_file = CACHE_DIR / "scripts_cache.json"
-    if cache_file.exists():
-        with open(cache_file) as f:
-            return json.load(f)
-    return {}
-
+        return None
 
-def save_cached_scripts(cache: dict):
-    cache_file = CACHE_DIR / "scripts_cache.json"
-    with open(cache_file, "w") as f:
-        json.dump(cache, f, indent=2)
+    scripts = {}
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        for url, content in zip(urls, pool.map(fetch, urls)):
+            if content is not None:
+                scripts[url] = content
+    return scripts
 
 
-def extract_ad_patterns(content: str) -> dict:
-    """Extract ad-related patterns from JavaScript content."""
+def compute_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
+def open_cache() -> sqlite3.Connection:
+    """Open the on-disk script cache, creating its tables on first use."""
+    conn = sqlite3.connect(CACHE_DIR / "scripts_cache.db")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS scripts "
+        "(url TEXT PRIMARY KEY, hash TEXT, last_seen TEXT, size INTEGER)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS inline_scripts "
+        "(endpoint TEXT, hash TEXT, patterns TEXT, PRIMARY KEY (endpoint, hash))"
+    )
+    return conn
+
+
+def load_cached_scripts(conn: sqlite3.Connection, urls: list[str]) -> dict[str, str]:
+    """Look up previously cached script hashes, returning {url: hash}."""
+    if not urls:
+        return {}
+    placeholders = ",".join("?" * len(urls))
+    rows = conn.execute(f"SELECT url, hash FROM scripts WHERE url IN ({placeholders})", urls)
+    return dict(rows)
+
+
+def save_cached_scripts(conn: sqlite3.Connection, cache: dict):
+    """Write changed script entries ({url: {hash, last_seen, size}}) in one transaction."""
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO scripts (url, hash, last_seen, size) VALUES (?, ?, ?, ?)",
+            [(url, e["hash"], e["last_seen"], e["size"]) for url, e in cache.items()],
+        )
+
+
+def inline_script_hash(content: bytes) -> str:
+    """Cache key for an inline script: its content under the current extractor version."""
+    return hashlib.blake2b(content, digest_size=16, key=INLINE_CACHE_KEY).hexdigest()
+
+
+def load_inline_patterns(conn: sqlite3.Connection, endpoint: str) -> dict[str, dict]:
+    """Load cached patterns for an endpoint's inline scripts, returning {hash: patterns}."""
+    rows = conn.execute("SELECT hash, patterns FROM inline_scripts WHERE endpoint = ?", (endpoint,))
+    return {h: json.loads(patterns) for h, patterns in rows}
+
+
+def save_inline_patterns(conn: sqlite3.Connection, inline_cache: dict):
+    """Replace each endpoint's cached inline-script patterns ({endpoint: {hash: patterns}})."""
+    with conn:
+        for endpoint, entries in inline_cache.items():
+            conn.execute("DELETE FROM inline_scripts WHERE endpoint = ?", (endpoint,))
+            conn.executemany(
+                "INSERT INTO inline_scripts (endpoint, hash, patterns) VALUES (?, ?, ?)",
+                [(endpoint, h, json.dumps(p, separators=(",", ":"))) for h, p in entries.items()],
+            )
+
+
+def classify_pattern(value: str) -> str:
+    """Pick the pattern bucket for a value captured by a generic pattern."""
+    if "ytp-ad-" in value:
+        return "ytp_classes"
+    elif "renderer" in value:
+        return "renderers"
+    elif "enforcement" in value.lower() or "adblock" in value.lower():
+        return "enforcement"
+    elif value.startswith("/") or value.startswith("http"):
+        return "url_patterns"
+    elif LOWER_START_RE.match(value) and '-' in value:
+        return "css_classes"
+    elif FUNCTION_START_RE.match(value):
+        return "functions"
+    return "css_classes"
+
+
+def extract_ad_patterns(content: bytes) -> dict:
+    """Extract ad-related patterns from raw JavaScript content."""
     patterns = {
         "css_classes": set(),
         "element_ids": set(),
@@ -127,105 +271,134 @@ def extract_ad_patterns(content: str) -> dict:
         "enforcement": set(),
     }
 
-    for regex in AD_PATTERN_REGEXES:
-        for match in re.finditer(regex, content):
-            value = match.group(1)
-            if "ytp-ad-" in value:
-                patterns["ytp_classes"].add(value)
-            elif "renderer" in value:
-                patterns["renderers"].add(value)
-            elif "enforcement" in value.lower() or "adblock" in value.lower():
-                patterns["enforcement"].add(value)
-            elif value.startswith("/") or value.startswith("http"):
-                patterns["url_patterns"].add(value)
-            elif re.match(r'^[a-z]', value) and '-' in value:
-                patterns["css_classes"].add(value)
-            elif re.match(r'^[A-Z]|^ad', value):
-                patterns["functions"].add(value)
-            else:
-                patterns["css_classes"].add(value)
+    # Matches repeat heavily; decode and classify each distinct value once
+    found = set()
+    for group, compiled in AD_RE_GROUPS:
+        found.update((group, raw) for raw in compiled.findall(content))
+    for group, raw in found:
+        value = raw.decode("utf-8", "replace")
+        bucket = GROUP_BUCKETS.get(group) or classify_pattern(value)
+        patterns[bucket].add(value)
 
     # Convert sets to sorted lists
     return {k: sorted(v) for k, v in patterns.items()}
 
 
+def scan_scripts(contents: list[bytes]) -> list[dict]:
+    """Run extract_ad_patterns over scripts, spreading them across processes."""
+    if len(contents) < 2:
+        return [extract_ad_patterns(content) for content in contents]
+    # Scripts are large, so hand them out one at a time
+    with ProcessPoolExecutor() as pool:
+        return list(pool.map(extract_ad_patterns, contents))
+
+
 def diff_patterns(old_patterns: dict, new_patterns: dict) -> dict:
-    """Find new patterns not in the old set."""
+    """Find new patterns not in the old set.
+
+    Both sides hold sorted lists (as saved by analyze()), so each bucket is
+    diffed with a single merge pass.
+    """
     diff = {}
-    for key in new_patterns:
-        old_set = set(old_patterns.get(key, []))
-        new_set = set(new_patterns[key])
-        added = new_set - old_set
+    for key, new_list in new_patterns.items():
+        old_list = old_patterns.get(key, [])
+        if old_list == new_list:
+            continue
+
+        added = []
+        i, n_old = 0, len(old_list)
+        for value in new_list:
+            while i < n_old and old_list[i] < value:
+                i += 1
+            if i == n_old or old_list[i] != value:
+                added.append(value)
         if added:
-            diff[key] = sorted(added)
+            diff[key] = added
     return diff
 
 
 def load_current_filters() -> dict:
-    """Load current filter files."""
+    """Load current filter files, indexing each by its rules' match keys."""
     filters = {}
     for name in ["youtube-cosmetic.json", "youtube-network.json", "youtube-scripts.json"]:
         path = FILTERS_DIR / name
         if path.exists():
             with open(path) as f:
                 filters[name] = json.load(f)
+
+    if "youtube-cosmetic.json" in filters:
+        cosmetic = filters["youtube-cosmetic.json"]
+        cosmetic["_selector_index"] = {r.get("selector") for r in cosmetic.get("rules", [])}
+    if "youtube-network.json" in filters:
+        network = filters["youtube-network.json"]
+        network["_pattern_index"] = {r.get("pattern") for r in network.get("rules", [])}
     return filters
 
 
-def generate_cosmetic_rules(new_patterns: dict, existing_rules: list) -> list:
-    """Generate new cosmetic filter rules from discovered patterns."""
-    existing_selectors = {r.get("selector") for r in existing_rules}
-    new_rules = list(existing_rules)
+def generate_cosmetic_rules(new_patterns: dict, cosmetic: dict) -> list:
+    """Add cosmetic filter rules for discovered patterns to `cosmetic` in place."""
+    new_rules = cosmetic.setdefault("rules", [])
+    if "_selector_index" not in cosmetic:
+        cosmetic["_selector_index"] = {r.get("selector") for r in new_rules}
+    existing_selectors = cosmetic["_selector_index"]
+    now_iso = datetime.now(timezone.utc).isoformat()
 
     # Add new YTP classes
     for cls in new_patterns.get("ytp_classes", []):
         selector = f".{cls}"
         if selector not in existing_selectors:
+            existing_selectors.add(selector)
             new_rules.append({
                 "id": f"auto-{cls}",
                 "selector": selector,
                 "description": f"Auto-discovered: {cls}",
-                "discovered": datetime.now(timezone.utc).isoformat()
+                "discovered": now_iso
             })
 
     # Add new renderers
     for renderer in new_patterns.get("renderers", []):
         selector = renderer
         if selector not in existing_selectors:
+            existing_selectors.add(selector)
             new_rules.append({
                 "id": f"auto-{renderer}",
                 "selector": selector,
                 "description": f"Auto-discovered renderer: {renderer}",
-                "discovered": datetime.now(timezone.utc).isoformat()
+                "discovered": now_iso
             })
 
     # Add enforcement patterns
     for pattern in new_patterns.get("enforcement", []):
         selector = f"[class*='{pattern}']"
         if selector not in existing_selectors:
+            existing_selectors.add(selector)
             new_rules.append({
                 "id": f"auto-enforce-{pattern}",
                 "selector": selector,
                 "description": f"Auto-discovered enforcement: {pattern}",
-                "discovered": datetime.now(timezone.utc).isoformat()
+                "discovered": now_iso
             })
 
     return new_rules
 
 
-def generate_network_rules(new_patterns: dict, existing_rules: list) -> list:
-    """Generate new network filter rules from discovered URL patterns."""
-    existing_patterns = {r.get("pattern") for r in existing_rules}
-    new_rules = list(existing_rules)
+def generate_network_rules(new_patterns: dict, network: dict) -> list:
+    """Add network filter rules for discovered URL patterns to `network` in place."""
+    new_rules = network.setdefault("rules", [])
+    if "_pattern_index" not in network:
+        network["_pattern_index"] = {r.get("pattern") for r in new_rules}
+    existing_patterns = network["_pattern_index"]
+    now_iso = datetime.now(timezone.utc).isoformat()
 
     for url_pattern in new_patterns.get("url_patterns", []):
         pattern = f"||youtube.com{url_pattern}" if url_pattern.startswith("/") else url_pattern
         if pattern not in existing_patterns:
+            existing_patterns.add(pattern)
             new_rules.append({
-                "id": f"auto-net-{compute_hash(pattern)}",
+                "id": f"auto-net-{compute_hash(pattern.encode())}",
                 "pattern": pattern,
                 "description": f"Auto-discovered: {url_pattern}",
-                "discovered": datetime.now(timezone.utc).isoformat()
+                "discovered": now_iso
             })
 
     return new_rules
@@ -266,8 +439,10 @@ def analyze():
     print("[AdaBlock Analyzer] Starting analysis...")
     print(f"  Endpoints: {len(config['youtube_endpoints'])}")
 
-    # Load cached data
-    cache = load_cached_scripts()
+    # Cached hashes are looked up per endpoint; changed entries collect here
+    conn = open_cache()
+    cache = {}
+    inline_cache = {}
     all_new_patterns = {
         "css_classes": set(),
         "element_ids": set(),
@@ -279,25 +454,39 @@ def analyze():
     }
 
     changed_scripts = 0
+    changed_contents = []
 
-    for endpoint in config["youtube_endpoints"]:
-        print(f"\n  Fetching: {endpoint}")
-        try:
-            html = fetch_page(endpoint)
-        except Exception as e:
-            print(f"    Error: {e}")
+    pages = fetch_pages(config["youtube_endpoints"])
+
+    for endpoint, html in pages.items():
+        print(f"\n  Fetched: {endpoint}")
+        if isinstance(html, Exception):
+            print(f"    Error: {html}")
             continue
 
-        # Extract inline script patterns
-        soup = BeautifulSoup(html, "html.parser")
+        # Extract inline script patterns, reusing results for unchanged scripts
+        soup = BeautifulSoup(html, HTML_PARSER)
+        cached_inline = load_inline_patterns(conn, endpoint)
+        inline_entries = inline_cache[endpoint] = {}
         for script in soup.find_all("script"):
             if script.string:
-                patterns = extract_ad_patterns(script.string)
+                if not (any(kw in script.string for kw in INLINE_SCRIPT_KEYWORDS)
+                        or INLINE_DECLARATION_RE.search(script.string)):
+                    continue
+                script_bytes = script.string.encode()
+                script_hash = inline_script_hash(script_bytes)
+                if script_hash in inline_entries:
+                    continue
+                if script_hash in cached_inline:
+                    patterns = cached_inline[script_hash]
+                else:
+                    patterns = {k: v for k, v in extract_ad_patterns(script_bytes).items() if v}
+                inline_entries[script_hash] = patterns
                 for k, v in patterns.items():
                     all_new_patterns[k].update(v)
 
         # Fetch external scripts
-        script_urls = extract_script_urls(html)
+        script_urls = extract_script_urls(soup)
         print(f"    Found {len(script_urls)} external scripts")
 
         # Filter to likely ad-related scripts
@@ -307,17 +496,15 @@ def analyze():
         print(f"    {len(relevant_urls)} relevant scripts")
 
         scripts = fetch_scripts(relevant_urls)
+        cached_hashes = load_cached_scripts(conn, list(scripts))
         for url, content in scripts.items():
             content_hash = compute_hash(content)
-            cached_hash = cache.get(url, {}).get("hash")
+            cached_hash = cache[url]["hash"] if url in cache else cached_hashes.get(url)
 
             if content_hash != cached_hash:
                 changed_scripts += 1
                 print(f"    CHANGED: {url[:80]}...")
-
-                patterns = extract_ad_patterns(content)
-                for k, v in patterns.items():
-                    all_new_patterns[k].update(v)
+                changed_contents.append(content)
 
                 # Update cache
                 cache[url] = {
@@ -326,7 +513,13 @@ def analyze():
                     "size": len(content)
                 }
 
-    save_cached_scripts(cache)
+    for patterns in scan_scripts(changed_contents):
+        for k, v in patterns.items():
+            all_new_patterns[k].update(v)
+
+    save_cached_scripts(conn, cache)
+    save_inline_patterns(conn, inline_cache)
+    conn.close()
 
     # Convert sets to lists
     new_patterns = {k: sorted(v) for k, v in all_new_patterns.items()}
@@ -341,8 +534,7 @@ def analyze():
     diff = diff_patterns(old_patterns, new_patterns)
 
     # Save new patterns
-    with open(old_patterns_file, "w") as f:
-        json.dump(new_patterns, f, indent=2)
+    write_json(old_patterns_file, new_patterns)
 
     print(f"\n  Scripts changed: {changed_scripts}")
     print(f"  New patterns found: {sum(len(v) for v in diff.values())}")
@@ -356,8 +548,8 @@ def analyze():
     network = current_filters.get("youtube-network.json", {})
     scripts = current_filters.get("youtube-scripts.json", {})
 
-    new_cosmetic = generate_cosmetic_rules(diff, cosmetic.get("rules", []))
-    new_network = generate_network_rules(diff, network.get("rules", []))
+    new_cosmetic = generate_cosmetic_rules(diff, cosmetic)
+    new_network = generate_network_rules(diff, network)
     script_rules = scripts.get("rules", [])
 
     # Bump version
@@ -369,8 +561,7 @@ def analyze():
 
     # Save output
     output_file = OUTPUT_DIR / f"filter-update-{new_version}.json"
-    with open(output_file, "w") as f:
-        json.dump(update, f, indent=2)
+    write_json(output_file, update, indent=True)
 
     print(f"\n  Filter update saved: {output_file}")
     print(f"  Version: {new_version}")
@@ -4,22 +4,51 @@ AdaBlock Monitor — Continuously tests current filters against live YouTube,
 detects breakage, and triggers the analyzer when filters stop working.
 """
 
+import gzip
 import json
 import logging
 import os
 import re
 import sys
 import time
+from functools import lru_cache
 from datetime import datetime, timezone
 from pathlib import Path
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    import soupsieve
     from bs4 import BeautifulSoup
 except ImportError:
     print("Install dependencies: pip install requests beautifulsoup4")
     sys.exit(1)
 
+# Optional: lxml parses HTML much faster than the pure-Python parser.
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Optional: orjson serializes check results much faster than json.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: RE2 scans in linear time; fall back to the stdlib engine.
+try:
+    import re2 as regex
+except ImportError:
+    regex = re
+
+# Optional: Aho-Corasick matches many substrings in one pass over the text.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 SCRIPT_DIR = Path(__file__).parent
 CONFIG_PATH = SCRIPT_DIR / "config.json"
 LOG_DIR = SCRIPT_DIR / "logs"
@@ -42,6 +71,27 @@ HEADERS = {
     "Accept-Language": "en-US,en;q=0.9",
 }
 
+# Shared keep-alive connections; requests already negotiates gzip (and br
+# when a brotli decoder is installed) by default.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32))
+
+# Enforcement-related JS identifiers
+ENFORCEMENT_JS_PATTERNS = [
+    "enforcement",
+    "adBlockerDetected",
+    "adblock_detected",
+    "showAdBlockMessage",
+    "adBlockOverlay",
+]
+
+# Server-rendered attributes that look ad-related
+SUSPICIOUS_ATTR_RES = [
+    regex.compile(r'class="[^"]*(?:ad[-_]|sponsor|promo)[^"]*"'),
+    regex.compile(r'id="[^"]*(?:ad[-_]|player-ads|masthead-ad)[^"]*"'),
+]
+
 
 def load_config():
     with open(CONFIG_PATH) as f:
@@ -56,18 +106,58 @@ def load_filters():
         if path.exists():
             with open(path) as f:
                 filters[name] = json.load(f)
+    if "youtube-cosmetic.json" in filters:
+        prepare_selectors(filters["youtube-cosmetic.json"])
     return filters
 
 
+@lru_cache(maxsize=None)
+def compile_selector(selector: str):
+    """Compile a CSS selector once; returns None if soupsieve rejects it."""
+    try:
+        return soupsieve.compile(selector)
+    except Exception:
+        return None  # Some selectors may not be valid for BS4
+
+
+def build_substring_matcher(needles):
+    """Return a predicate telling whether a string contains any of the needles."""
+    needles = set(needles)
+    if "" in needles:
+        return lambda text: True
+    if not needles:
+        return lambda text: False
+    if ahocorasick is None:
+        needles_re = regex.compile("|".join(regex.escape(needle) for needle in needles))
+        return lambda text: needles_re.search(text) is not None
+
+    automaton = ahocorasick.Automaton()
+    for needle in needles:
+        automaton.add_word(needle, needle)
+    automaton.make_automaton()
+    return lambda text: next(automaton.iter(text), None) is not None
+
+
+def prepare_selectors(cosmetic_filters: dict):
+    """Precompile rule selectors and the known-selector matcher in place."""
+    rules = cosmetic_filters.get("rules", [])
+    for rule in rules:
+        selector = rule.get("selector", "")
+        if selector:
+            rule["_compiled"] = compile_selector(selector)
+    cosmetic_filters["_has_known_selector"] = build_substring_matcher(
+        r.get("selector", "") for r in rules
+    )
+
+
 def fetch_page(url: str) -> str:
-    resp = requests.get(url, headers=HEADERS, timeout=30)
+    resp = SESSION.get(url, timeout=30)
     resp.raise_for_status()
     return resp.text
 
 
-def check_cosmetic_coverage(html: str, cosmetic_filters: dict) -> dict:
+def check_cosmetic_coverage(html: str, soup: BeautifulSoup, cosmetic_filters: dict) -> dict:
     """Check if known ad selectors are still present in the page."""
-    soup = BeautifulSoup(html, "html.parser")
     results = {"covered": 0, "missing": 0, "new_suspicious": []}
 
     rules = cosmetic_filters.get("rules", [])
@@ -75,32 +165,31 @@ def check_cosmetic_coverage(html: str, cosmetic_filters: dict) -> dict:
         selector = rule.get("selector", "")
         if not selector:
             continue
+        compiled = rule["_compiled"] if "_compiled" in rule else compile_selector(selector)
+        if compiled is None:
+            continue
         try:
             # CSS selector matching on server-rendered HTML
-            matches = soup.select(selector)
-            if matches:
+            if compiled.select_one(soup) is not None:
                 results["covered"] += 1
         except Exception:
-            pass  # Some selectors may not be valid for BS4
+            pass
 
     # Look for new suspicious elements not in our filters
-    known_selectors = {r.get("selector", "") for r in rules}
-    ad_patterns = [
-        r'class="[^"]*(?:ad[-_]|sponsor|promo)[^"]*"',
-        r'id="[^"]*(?:ad[-_]|player-ads|masthead-ad)[^"]*"',
-    ]
-    for pattern in ad_patterns:
-        for match in re.finditer(pattern, html):
+    has_known_selector = cosmetic_filters.get("_has_known_selector") or build_substring_matcher(
+        r.get("selector", "") for r in rules
+    )
+    for pattern in SUSPICIOUS_ATTR_RES:
+        for match in pattern.finditer(html):
             value = match.group(0)
-            if not any(sel in value for sel in known_selectors):
+            if not has_known_selector(value):
                 results["new_suspicious"].append(value[:100])
 
     return results
 
 
-def check_anti_adblock_presence(html: str) -> dict:
+def check_anti_adblock_presence(html: str, indicators: list[str]) -> dict:
     """Check if anti-adblock mechanisms are present in the page."""
-    indicators = load_config().get("ad_indicators", {}).get("text_patterns", [])
     results = {"detected": False, "patterns": []}
 
     html_lower = html.lower()
@@ -110,14 +199,7 @@ def check_anti_adblock_presence(html: str) -> dict:
             results["patterns"].append(pattern)
 
     # Check for enforcement-related JS
-    enforcement_patterns = [
-        "enforcement",
-        "adBlockerDetected",
-        "adblock_detected",
-        "showAdBlockMessage",
-        "adBlockOverlay",
-    ]
-    for pattern in enforcement_patterns:
+    for pattern in ENFORCEMENT_JS_PATTERNS:
         if pattern in html:
             results["detected"] = True
             results["patterns"].append(f"js:{pattern}")
@@ -125,9 +207,8 @@ def check_anti_adblock_presence(html: str) -> dict:
     return results
 
 
-def check_ad_script_changes(html: str) -> dict:
+def check_ad_script_changes(soup: BeautifulSoup) -> dict:
     """Check if ad-serving script URLs have changed."""
-    soup = BeautifulSoup(html, "html.parser")
     results = {"scripts_found": 0, "player_scripts": [], "ad_scripts": []}
 
     for script in soup.find_all("script", src=True):
@@ -153,6 +234,7 @@ def run_check(config: dict) -> dict:
 
     filters = load_filters()
     cosmetic = filters.get("youtube-cosmetic.json", {})
+    indicators = config.get("ad_indicators", {}).get("text_patterns", [])
     total_suspicious = 0
     anti_adblock_count = 0
 
@@ -162,20 +244,21 @@ def run_check(config: dict) -> dict:
 
         try:
             html = fetch_page(endpoint)
+            soup = BeautifulSoup(html, HTML_PARSER)
 
             # Check 1: Cosmetic filter coverage
-            coverage = check_cosmetic_coverage(html, cosmetic)
+            coverage = check_cosmetic_coverage(html, soup, cosmetic)
             endpoint_result["checks"]["cosmetic"] = coverage
             total_suspicious += len(coverage.get("new_suspicious", []))
 
             # Check 2: Anti-adblock presence
-            anti_adblock = check_anti_adblock_presence(html)
+            anti_adblock = check_anti_adblock_presence(html, indicators)
             endpoint_result["checks"]["anti_adblock"] = anti_adblock
             if anti_adblock["detected"]:
                 anti_adblock_count += 1
 
             # Check 3: Script changes
-            script_changes = check_ad_script_changes(html)
+            script_changes = check_ad_script_changes(soup)
             endpoint_result["checks"]["scripts"] = script_changes
 
             log.info(f"  Coverage: {coverage['covered']} selectors matched")
@@ -251,10 +334,14 @@ def monitor_loop():
         try:
             results = run_check(config)
 
-            # Save results
-            results_file = LOG_DIR / f"check-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
-            with open(results_file, "w") as f:
-                json.dump(results, f, indent=2)
+            # Save results (compact and gzipped; nobody reads these by hand)
+            results_file = LOG_DIR / f"check-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json.gz"
+            if orjson is not None:
+                payload = orjson.dumps(results)
+            else:
+                payload = json.dumps(results, separators=(",", ":")).encode()
+            with gzip.open(results_file, "wb") as f:
+                f.write(payload)
 
             # If breakage detected, trigger analysis + publishing
             if results["breakage_detected"] or results["new_patterns_found"]:
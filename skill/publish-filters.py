@@ -4,6 +4,8 @@ Publish AdaBlock seed filters to Nostr relays as kind 30078 events.
 Uses Scout's actual Nostr key for real Schnorr signatures.
 """
 
+import base64
+import gzip
 import hashlib
 import json
 import time
@@ -13,6 +15,12 @@ from pathlib import Path
 import websockets
 import secp256k1
 
+# Optional: orjson serializes large filter payloads much faster than json.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 SCRIPT_DIR = Path(__file__).parent
 EXTENSION_DIR = SCRIPT_DIR.parent / "extension"
 SECRET_KEY_PATH = Path.home() / ".clawstr" / "secret.key"
@@ -26,6 +34,7 @@ RELAYS = [
 
 KIND = 30078
 D_TAG = "adablock-filters"
+CONTENT_ENCODING = "gzip+b64"
 
 
 def load_secret_key():
@@ -38,26 +47,34 @@ def load_secret_key():
     return key_hex
 
 
-def get_pubkey(privkey_hex: str) -> str:
+def get_pubkey(sk: secp256k1.PrivateKey) -> str:
     """Derive public key from private key."""
-    sk = secp256k1.PrivateKey(bytes.fromhex(privkey_hex))
     # Get compressed pubkey, strip the 02/03 prefix for Nostr (x-only)
     pubkey_bytes = sk.pubkey.serialize(compressed=True)
     return pubkey_bytes[1:].hex()  # Strip prefix byte
 
 
-def compute_event_id(pubkey, created_at, kind, tags, content):
-    serialized = json.dumps(
-        [0, pubkey, created_at, kind, tags, content],
-        separators=(",", ":"),
-        ensure_ascii=False
-    )
-    return hashlib.sha256(serialized.encode()).hexdigest()
+def dumps_compact(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON (no whitespace, non-ASCII kept as-is)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
 
 
-def sign_event(event_id_hex: str, privkey_hex: str) -> str:
+def compute_event_id(pubkey, created_at, kind, tags, content):
+    # Feed the preimage to SHA-256 in pieces: the small event header, then the
+    # escaped content, so the large content is never copied into one
+    # serialization of the whole array.
+    head = dumps_compact([0, pubkey, created_at, kind, tags])
+    h = hashlib.sha256(head[:-1])
+    h.update(b",")
+    h.update(dumps_compact(content))
+    h.update(b"]")
+    return h.hexdigest()
+
+
+def sign_event(event_id_hex: str, sk: secp256k1.PrivateKey) -> str:
     """Create real Schnorr signature."""
-    sk = secp256k1.PrivateKey(bytes.fromhex(privkey_hex))
     # BIP-340 Schnorr signature with "BIP0340/challenge" tag for Nostr
     sig = sk.schnorr_sign(bytes.fromhex(event_id_hex), bip340tag=b'', raw=True)
     return sig.hex()
@@ -86,19 +103,25 @@ def load_seed_filters():
     }
 
 
-def create_event(filter_data, privkey_hex, pubkey_hex):
-    content = json.dumps(filter_data, separators=(",", ":"))
+def encode_content(filter_data) -> str:
+    """Gzip and base64-encode the filter payload (mtime=0 keeps it deterministic)."""
+    return base64.b64encode(gzip.compress(dumps_compact(filter_data), 9, mtime=0)).decode()
+
+
+def create_event(filter_data, sk, pubkey_hex):
+    content = encode_content(filter_data)
     created_at = int(time.time())
     tags = [
         ["d", D_TAG],
         ["version", filter_data["version"]],
         ["t", "adablock"],
         ["t", "ad-filter"],
-        ["t", "youtube"]
+        ["t", "youtube"],
+        ["encoding", CONTENT_ENCODING]
     ]
 
     event_id = compute_event_id(pubkey_hex, created_at, KIND, tags, content)
-    sig = sign_event(event_id, privkey_hex)
+    sig = sign_event(event_id, sk)
 
     return {
         "id": event_id,
@@ -141,9 +164,9 @@ async def main():
     print("🛡️  AdaBlock Filter Publisher")
     print("=" * 40)
 
-    # Load key
-    privkey = load_secret_key()
-    pubkey = get_pubkey(privkey)
+    # Load key; the signing context is built once and reused for every event
+    sk = secp256k1.PrivateKey(bytes.fromhex(load_secret_key()))
+    pubkey = get_pubkey(sk)
     print(f"Pubkey: {pubkey[:16]}...")
 
     # Load filters
@@ -153,7 +176,7 @@ async def main():
           f"{filters['stats']['script_count']} scripts")
 
     # Create event
-    event = create_event(filters, privkey, pubkey)
+    event = create_event(filters, sk, pubkey)
     print(f"Event ID: {event['id'][:16]}...")
     print(f"\nPublishing to {len(RELAYS)} relays...")
 
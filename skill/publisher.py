@@ -11,21 +11,88 @@ import secrets
 import sys
 import time
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
 try:
     import websockets
+    from websockets.protocol import State
     import asyncio
 except ImportError:
     print("Install dependencies: pip install websockets")
     sys.exit(1)
 
+# Optional: uvloop's libuv event loop speeds up the relay fan-out (not on Windows).
+# publish() runs on a loop from this factory; the global loop policy is left alone.
+_new_event_loop = asyncio.new_event_loop
+if sys.platform != "win32":
+    try:
+        from uvloop import new_event_loop as _new_event_loop
+    except ImportError:
+        pass
+
+# Optional: orjson emits compact UTF-8 JSON bytes (and parses bytes) much faster than json.
+# Both backends produce the NIP-01 canonical form (no whitespace, raw UTF-8, same escapes),
+# so event IDs are byte-identical whichever one is installed.
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    _loads = json.loads
+    _json_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+    def _dumps(obj) -> bytes:
+        return _json_encoder.encode(obj).encode()
+
+# Resolve the Schnorr backend once: coincurve, then secp256k1, then an HMAC
+# placeholder (NOT valid Schnorr — for development only).
+try:
+    from coincurve import PrivateKey as _PrivateKey, PublicKeyXOnly
+
+    def _sign(sk, msg: bytes) -> bytes:
+        return sk.sign_schnorr(msg)
+
+    def _verify(pubkey: bytes, msg: bytes, sig: bytes) -> bool:
+        return PublicKeyXOnly(pubkey).verify(sig, msg)
+except ImportError:
+    try:
+        import secp256k1
+        if not hasattr(secp256k1.PrivateKey, "schnorr_sign"):
+            raise ImportError("secp256k1 built without Schnorr support")
+        _PrivateKey = secp256k1.PrivateKey
+
+        def _sign(sk, msg: bytes) -> bytes:
+            return sk.schnorr_sign(msg, bip340tag=b"", raw=True)
+
+        def _verify(pubkey: bytes, msg: bytes, sig: bytes) -> bool:
+            pk = secp256k1.PublicKey(b"\x02" + pubkey, raw=True)
+            return pk.schnorr_verify(msg, sig, bip340tag=b"", raw=True)
+    except ImportError:
+        import hmac
+        _PrivateKey = bytes
+
+        def _sign(sk, msg: bytes) -> bytes:
+            # Two domain-separated HMACs give 64 bytes, matching Schnorr sig length
+            return (hmac.new(sk, msg + b"\x01", hashlib.sha256).digest()
+                    + hmac.new(sk, msg + b"\x02", hashlib.sha256).digest())
+
+        def _verify(pubkey: bytes, msg: bytes, sig: bytes) -> bool:
+            return False  # Placeholder signatures cannot be checked against a pubkey
+
 SCRIPT_DIR = Path(__file__).parent
 CONFIG_PATH = SCRIPT_DIR / "config.json"
 OUTPUT_DIR = SCRIPT_DIR / "output"
 
 NOSTR_KIND_REPLACEABLE_PARAM = 30078
 D_TAG = "adablock-filters"
+# Topic tags on every event; only the version tag varies
+_STATIC_TAGS = (("t", "adablock"), ("t", "ad-filter"), ("t", "youtube"))
+# Seconds to wait for a pooled socket's pong before replacing the connection
+RELAY_PROBE_TIMEOUT = 5.0
 
 
 def load_config():
@@ -35,10 +102,11 @@ def load_config():
 
 def generate_keypair():
     """Generate a new Nostr keypair (simplified — uses random bytes as private key)."""
-    private_key = secrets.token_hex(32)
+    priv_bytes = secrets.token_bytes(32)
+    private_key = priv_bytes.hex()
     # In production, derive public key using secp256k1 Schnorr
     # For now, use SHA-256 hash as placeholder pubkey
-    public_key = hashlib.sha256(bytes.fromhex(private_key)).hexdigest()
+    public_key = hashlib.sha256(priv_bytes).hexdigest()
 
     print(f"Private key (hex): {private_key}")
     print(f"Public key (hex):  {public_key}")
@@ -48,130 +116,330 @@ def generate_keypair():
     return private_key, public_key
 
 
+@lru_cache(maxsize=8)
+def _event_hasher(pubkey: str):
+    """SHA-256 context already fed the per-key preimage prefix '[0,"<pubkey>",'."""
+    return hashlib.sha256(b"[0," + _dumps(pubkey) + b",")
+
+
+def _compute_event_id_bytes(pubkey: str, created_at: int, kind: int, tags: list, content: str) -> bytes:
+    """Compute the raw 32-byte Nostr event ID (SHA-256 of serialized event)."""
+    h = _event_hasher(pubkey).copy()
+    h.update(_dumps([created_at, kind, tags, content])[1:])
+    return h.digest()
+
+
+def _escape_compact_json(content_json: bytes) -> bytes:
+    """
+    Escape compact JSON (as produced by _dumps) for embedding as a JSON string.
+    Compact JSON has no raw control characters, so only backslash and quote need escaping.
+    """
+    return content_json.replace(b"\\", b"\\\\").replace(b'"', b'\\"')
+
+
+def _event_tags(version: str) -> list:
+    """Tags for a filter event: d-tag, version, then the static topic tags."""
+    return [["d", D_TAG], ["version", version], *[[k, v] for k, v in _STATIC_TAGS]]
+
+
+@lru_cache(maxsize=16)
+def _filter_preimage_middle(version: str) -> bytes:
+    """
+    Preimage bytes between created_at and the content string of a filter event:
+    ',<kind>,<tags>,"'. Kind and tags are fixed apart from the version tag.
+    """
+    return b',%d,%s,"' % (NOSTR_KIND_REPLACEABLE_PARAM, _dumps(_event_tags(version)))
+
+
+def _filter_event_id(pubkey: str, created_at: int, version: str, content_json: bytes) -> bytes:
+    """
+    Raw event ID for a filter event, specialized to its fixed schema.
+    Only created_at and the escaped content are fed per call; the rest is cached.
+    """
+    h = _event_hasher(pubkey).copy()
+    h.update(b"%d" % created_at)
+    h.update(_filter_preimage_middle(version))
+    h.update(_escape_compact_json(content_json))
+    h.update(b'"]')
+    return h.digest()
+
+
 def compute_event_id(pubkey: str, created_at: int, kind: int, tags: list, content: str) -> str:
     """Compute Nostr event ID (SHA-256 of serialized event)."""
-    serialized = json.dumps(
-        [0, pubkey, created_at, kind, tags, content],
-        separators=(",", ":"),
-        ensure_ascii=False
-    )
-    return hashlib.sha256(serialized.encode()).hexdigest()
+    return _compute_event_id_bytes(pubkey, created_at, kind, tags, content).hex()
+
 
+def load_signing_key(private_key_hex: str):
+    """Parse the private key once into the object sign_event() expects."""
+    return _PrivateKey(bytes.fromhex(private_key_hex))
 
-def sign_event(event_id: str, private_key_hex: str) -> str:
+
+def sign_event(event_id: bytes, signing_key) -> str:
     """
-    Sign event with Schnorr signature.
+    Sign a raw 32-byte event ID with a Schnorr signature.
     Uses secp256k1/coincurve if available, otherwise falls back to HMAC placeholder.
     """
-    try:
-        from coincurve import PrivateKey
-        sk = PrivateKey(bytes.fromhex(private_key_hex))
-        sig = sk.sign_schnorr(bytes.fromhex(event_id))
-        return sig.hex()
-    except ImportError:
-        pass
+    return _sign(signing_key, event_id).hex()
 
-    try:
-        import secp256k1
-        sk = secp256k1.PrivateKey(bytes.fromhex(private_key_hex))
-        sig = sk.schnorr_sign(bytes.fromhex(event_id))
-        return sig.hex()
-    except (ImportError, AttributeError):
-        pass
 
-    # Fallback: HMAC-based placeholder (NOT valid Schnorr — for development only)
-    import hmac
-    sig = hmac.new(
-        bytes.fromhex(private_key_hex),
-        bytes.fromhex(event_id),
-        hashlib.sha256
-    ).hexdigest()
-    # Pad to 128 hex chars (64 bytes) to match Schnorr sig length
-    return (sig * 2)[:128]
+def verify_events(events: list[dict]) -> list[bool]:
+    """
+    Verify a batch of events (e.g. updates fetched back from relays).
+    Checks each event's ID against its fields and its Schnorr signature against its pubkey.
+    """
+    verify = _verify
+    results = []
+    for event in events:
+        try:
+            event_id = _compute_event_id_bytes(
+                event["pubkey"], event["created_at"], event["kind"], event["tags"], event["content"]
+            )
+            ok = event_id.hex() == event["id"] and verify(
+                bytes.fromhex(event["pubkey"]), event_id, bytes.fromhex(event["sig"])
+            )
+        except Exception:
+            ok = False  # Malformed event or key rejected by the backend
+        results.append(bool(ok))
+    return results
 
 
-def create_event(filter_data: dict, private_key_hex: str, public_key_hex: str) -> dict:
-    """Create a signed Nostr event for filter update."""
-    content = json.dumps(filter_data, separators=(",", ":"))
-    created_at = int(time.time())
-    tags = [
-        ["d", D_TAG],
-        ["version", filter_data.get("version", "unknown")],
-        ["t", "adablock"],
-        ["t", "ad-filter"],
-        ["t", "youtube"]
-    ]
+def create_event(filter_data: dict, signing_key, public_key_hex: str, created_at: int | None = None) -> dict:
+    """
+    Create a signed Nostr event for filter update.
+    Pass created_at to stamp several events from one publish with the same time.
+    """
+    # Serialize once; the ID preimage embeds these bytes escaped, not re-serialized
+    content_json = _dumps(filter_data)
+    if created_at is None:
+        created_at = int(time.time())
+    version = filter_data.get("version", "unknown")
 
-    event_id = compute_event_id(public_key_hex, created_at, NOSTR_KIND_REPLACEABLE_PARAM, tags, content)
-    sig = sign_event(event_id, private_key_hex)
+    event_id = _filter_event_id(public_key_hex, created_at, version, content_json)
+    sig = sign_event(event_id, signing_key)
 
     return {
-        "id": event_id,
+        "id": event_id.hex(),
         "pubkey": public_key_hex,
         "created_at": created_at,
         "kind": NOSTR_KIND_REPLACEABLE_PARAM,
-        "tags": tags,
-        "content": content,
+        "tags": _event_tags(version),
+        "content": content_json.decode(),
         "sig": sig
     }
 
 
-async def publish_to_relay(relay_url: str, event: dict, timeout: float = 15.0) -> bool:
-    """Publish an event to a single Nostr relay."""
-    try:
-        async with websockets.connect(relay_url, close_timeout=5) as ws:
-            msg = json.dumps(["EVENT", event])
-            await ws.send(msg)
+class RelayPool:
+    """
+    Keeps one open WebSocket per relay, connected lazily on first use.
+    Sockets belong to the event loop that opened them, so share a pool only
+    between publishes running on the same loop.
+    """
 
-            # Wait for OK response
+    def __init__(self):
+        self._sockets = {}
+        self._locks = {}
+
+    def lock(self, relay_url: str) -> asyncio.Lock:
+        """Lock serializing request/response exchanges on one relay socket."""
+        return self._locks.setdefault(relay_url, asyncio.Lock())
+
+    @staticmethod
+    async def _alive(ws) -> bool:
+        """Ping a pooled socket; False if it is closed or the pong doesn't arrive in time."""
+        if ws.state is not State.OPEN:
+            return False
+        try:
+            pong = await ws.ping()
+            await asyncio.wait_for(pong, RELAY_PROBE_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    async def get(self, relay_url: str):
+        """
+        Return a live socket for the relay. Nothing runs on a pooled socket between
+        publishes, so a relay or NAT may have dropped it silently; it is probed first
+        and replaced with a fresh connection if it doesn't answer.
+        """
+        ws = self._sockets.get(relay_url)
+        if ws is not None and not await self._alive(ws):
+            await self.discard(relay_url)
+            ws = None
+        if ws is None:
+            # Frames are small JSON: no deflate, and relay replies (OK/NOTICE) are tiny.
+            # No keepalive pings: the loop is stopped between publishes, so get()
+            # probes pooled sockets itself.
+            ws = await websockets.connect(
+                relay_url, open_timeout=5, close_timeout=1, ping_interval=None,
+                max_size=2**18, compression=None
+            )
+            self._sockets[relay_url] = ws
+        return ws
+
+    async def discard(self, relay_url: str):
+        """Drop a relay's socket (e.g. after an error) so the next get() reconnects."""
+        ws = self._sockets.pop(relay_url, None)
+        if ws is not None:
             try:
-                response = await asyncio.wait_for(ws.recv(), timeout=timeout)
-                data = json.loads(response)
-                if data[0] == "OK" and data[2] is True:
-                    print(f"  ✓ Published to {relay_url}")
-                    return True
-                else:
-                    print(f"  ✗ Rejected by {relay_url}: {data}")
-                    return False
-            except asyncio.TimeoutError:
-                print(f"  ? Timeout from {relay_url} (event may still be accepted)")
-                return True  # Optimistic
+                await ws.close()
+            except Exception:
+                pass
+
+    async def close(self):
+        for relay_url in list(self._sockets):
+            await self.discard(relay_url)
+
+
+async def _await_ok(ws, relay_url: str, event_id: str, ok_prefix: str) -> bool:
+    """
+    Read frames until the relay's OK for event_id. A pooled socket may also carry
+    NOTICE/AUTH frames or late OKs for earlier events; those are logged and skipped.
+    """
+    while True:
+        response = await ws.recv()
+        if isinstance(response, bytes):
+            response = response.decode("utf-8", "replace")  # Binary frame
+        if response.startswith(ok_prefix):
+            print(f"  ✓ Published to {relay_url}")
+            return True
+
+        # Slow path: parse the frame, either to accept unusual spacing or to log the rejection
+        data = _loads(response)
+        if data[0] == "OK" and data[1] == event_id:
+            if data[2] is True:
+                print(f"  ✓ Published to {relay_url}")
+                return True
+            print(f"  ✗ Rejected by {relay_url}: {data}")
+            return False
+        print(f"  · Skipped from {relay_url}: {data}")
+
+
+async def publish_to_relay(relay_url: str, msg: str, event_id: str, pool: RelayPool,
+                           sent: set) -> bool:
+    """
+    Publish a prebuilt ["EVENT", event] message (for event_id) to a single Nostr relay.
+    Adds relay_url to `sent` once the event is on the wire; the caller owns the deadline.
+    """
+    ok_prefix = f'["OK","{event_id}",true'
+    try:
+        async with pool.lock(relay_url):
+            ws = await pool.get(relay_url)
+            await ws.send(msg)
+            sent.add(relay_url)
+            return await _await_ok(ws, relay_url, event_id, ok_prefix)
+    except asyncio.CancelledError:
+        # A response may still arrive on this socket; don't let it be reused
+        await pool.discard(relay_url)
+        raise
     except Exception as e:
+        await pool.discard(relay_url)
         print(f"  ✗ Error publishing to {relay_url}: {e}")
         return False
 
 
-async def publish_to_all_relays(event: dict, relays: list[str]) -> dict:
-    """Publish event to all configured relays."""
-    results = {}
-    tasks = [publish_to_relay(relay, event) for relay in relays]
-    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+async def publish_to_all_relays(event: dict, relays: list[str], pool: RelayPool | None = None,
+                                timeout: float = 15.0) -> dict:
+    """
+    Publish event to all configured relays under a single deadline.
+    Pass a long-lived pool to reuse relay connections across publishes;
+    otherwise a temporary one is opened and closed here.
+    """
+    own_pool = pool is None
+    if own_pool:
+        pool = RelayPool()
 
-    for relay, outcome in zip(relays, outcomes):
-        if isinstance(outcome, Exception):
+    # The message is identical for every relay, so serialize it once.
+    # Relays expect text frames, so send str rather than bytes.
+    msg = _dumps(["EVENT", event]).decode()
+
+    results = {}
+    sent = set()
+    tasks = {asyncio.ensure_future(publish_to_relay(relay, msg, event["id"], pool, sent)): relay for relay in relays}
+    pending = set()
+    try:
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    finally:
+        if own_pool:
+            await pool.close()
+
+    for task, relay in tasks.items():
+        if task in pending:
+            if relay in sent:
+                print(f"  ? Timeout from {relay} (event may still be accepted)")
+                results[relay] = True  # Optimistic
+            else:
+                print(f"  ✗ Timeout connecting to {relay}")
+                results[relay] = False
+        elif task.exception() is not None:
             results[relay] = False
-            print(f"  ✗ Exception for {relay}: {outcome}")
+            print(f"  ✗ Exception for {relay}: {task.exception()}")
         else:
-            results[relay] = outcome
+            results[relay] = task.result()
 
     return results
 
 
+# Loop and relay pool kept across publish() calls in one process (e.g. from
+# monitor.py) so relay connections are reused; sockets are tied to their loop.
+_publish_loop = None
+_relay_pool = None
+
+
+def _publish_session() -> tuple:
+    """Return the long-lived (loop, pool) used by publish(), creating them on first use."""
+    global _publish_loop, _relay_pool
+    if _publish_loop is None or _publish_loop.is_closed():
+        _publish_loop = _new_event_loop()
+        _relay_pool = RelayPool()
+    return _publish_loop, _relay_pool
+
+
+def close_publish_session():
+    """Close pooled relay connections and the loop they run on."""
+    global _publish_loop, _relay_pool
+    if _publish_loop is not None and not _publish_loop.is_closed():
+        _publish_loop.run_until_complete(_relay_pool.close())
+        _publish_loop.close()
+    _publish_loop = _relay_pool = None
+
+
+# Last update read by get_latest_update: (path, mtime_ns, data)
+_latest_update_cache = None
+
+
 def get_latest_update() -> dict | None:
     """Get the latest filter update from output directory."""
+    global _latest_update_cache
     if not OUTPUT_DIR.exists():
         return None
 
-    files = sorted(OUTPUT_DIR.glob("filter-update-*.json"), reverse=True)
-    if not files:
+    with os.scandir(OUTPUT_DIR) as entries:
+        latest = max(
+            (e for e in entries if e.name.startswith("filter-update-") and e.name.endswith(".json")),
+            key=lambda e: e.name,
+            default=None,
+        )
+    if latest is None:
         return None
 
-    with open(files[0]) as f:
-        return json.load(f)
+    # Skip the read when the same file is still unchanged (e.g. repeated publishes)
+    mtime_ns = latest.stat().st_mtime_ns
+    if _latest_update_cache and _latest_update_cache[:2] == (latest.path, mtime_ns):
+        return _latest_update_cache[2]
+
+    with open(latest.path, "rb") as f:
+        data = _loads(f.read())
+    _latest_update_cache = (latest.path, mtime_ns, data)
+    return data
 
 
 def publish(filter_data: dict = None):
     """Main publish function."""
+    created_at = int(time.time())
     config = load_config()
 
     if filter_data is None:
@@ -194,10 +462,11 @@ def publish(filter_data: dict = None):
     print(f"  Pubkey: {public_key[:16]}...")
     print(f"  Relays: {len(config['relays'])}")
 
-    event = create_event(filter_data, private_key, public_key)
+    event = create_event(filter_data, load_signing_key(private_key), public_key, created_at)
     print(f"  Event ID: {event['id'][:16]}...")
 
-    results = asyncio.run(publish_to_all_relays(event, config["relays"]))
+    loop, pool = _publish_session()
+    results = loop.run_until_complete(publish_to_all_relays(event, config["relays"], pool))
 
     success = sum(1 for v in results.values() if v)
     total = len(results)
@@ -210,4 +479,7 @@ if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "--keygen":
         generate_keypair()
     else:
-        publish()
+        try:
+            publish()
+        finally:
+            close_publish_session()